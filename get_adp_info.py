@@ -1,77 +1,270 @@
 import requests
 import argparse
+import json
+import os
+import re
+import sys
+import tempfile
+import time
+from pathlib import Path
+from concurrent.futures import ThreadPoolExecutor
+from requests.adapters import HTTPAdapter
 from config import CLIENT_ID, CLIENT_SECRET
+from http_retry import RETRY_POLICY
+
+try:
+    import orjson  # optional, much faster on the large workers payload
+    _loads = orjson.loads
+except ImportError:
+    _loads = json.loads
 
 ADP_TOKEN_URL = "https://api.adp.com/auth/oauth/v2/token"
 ADP_WORKERS_URL = "https://api.adp.com/hr/v2/workers"
 
 CERT = ("adp_integration.crt", "adp_integration.key")  # mTLS
 
+# Workers per page; ADP_FALLBACK_PAGE_SIZE is used if ADP rejects the larger size
+ADP_PAGE_SIZE = 100
+ADP_FALLBACK_PAGE_SIZE = 50
+
+# Pages after the first are fetched concurrently in waves that double from
+# one page up to PAGE_WAVE, so small tenants don't request pages past their end
+PAGE_FETCH_THREADS = 8
+PAGE_WAVE = 16
+
+# OData projections: only request the worker fields a command actually reads
+STATS_FIELDS = (
+    "workers/workerStatus",
+    "workers/workAssignments/jobTitle",
+)
+ORG_CHART_FIELDS = (
+    "workers/associateOID",
+    "workers/workerID",
+    "workers/workerStatus",
+    "workers/person/legalName",
+    "workers/workAssignments/jobTitle",
+    "workers/workAssignments/reportsTo",
+)
+
+# Access tokens are cached here and reused until shortly before they expire
+ADP_TOKEN_CACHE = Path.home() / ".adp_token.json"
+TOKEN_EXPIRY_SKEW = 60  # seconds
+
+# Optional mailto:, optional "Name <", then the address itself
+_EMAIL_RE = re.compile(
+    r"^\s*(?:mailto:)?\s*(?:[^<]*<\s*)?([^<>\s,;]+@[^<>\s,;]+)", re.IGNORECASE
+)
+
+_SESSION = None
+_TOKEN = None  # {"client_id", "access_token", "expires_at"} for this process
+
+
+def get_adp_session():
+    """
+    Return the process-wide ADP session.
+    The client cert lives on the session, so the mTLS handshake is done once
+    per pooled connection instead of once per request.
+    """
+    global _SESSION
+    if _SESSION is None:
+        session = requests.Session()
+        session.cert = CERT
+        adapter = HTTPAdapter(
+            pool_connections=4, pool_maxsize=16, max_retries=RETRY_POLICY
+        )
+        session.mount("https://", adapter)
+        _SESSION = session
+    return _SESSION
+
+
+def _read_cached_token():
+    """Return the on-disk token cache entry, or None if missing/unreadable."""
+    try:
+        with open(ADP_TOKEN_CACHE, "r", encoding="utf-8") as f:
+            cached = json.load(f)
+    except (OSError, ValueError):
+        return None
+    if not isinstance(cached, dict) or cached.get("client_id") != CLIENT_ID:
+        return None
+    if not cached.get("access_token") or not isinstance(
+        cached.get("expires_at"), (int, float)
+    ):
+        return None
+    return cached
+
+
+def _write_cached_token(cached):
+    """Atomically replace the on-disk token cache (file mode 0600)."""
+    try:
+        # mkstemp creates the file with 0600 permissions
+        fd, tmp_path = tempfile.mkstemp(
+            dir=ADP_TOKEN_CACHE.parent, prefix=".adp_token.", suffix=".tmp"
+        )
+    except OSError:
+        return
+    try:
+        with os.fdopen(fd, "w", encoding="utf-8") as f:
+            json.dump(cached, f)
+        os.replace(tmp_path, ADP_TOKEN_CACHE)
+    except OSError:
+        # The cache is best effort; a failed write only costs a re-mint next run
+        try:
+            os.remove(tmp_path)
+        except OSError:
+            pass
+
+
+def get_adp_token(session, force_refresh=False):
+    """
+    Return a valid ADP access token.
+    Reuses the in-process or on-disk cached token while it has more than
+    TOKEN_EXPIRY_SKEW seconds left; otherwise mints a new one.
+    """
+    global _TOKEN
+    now = time.time()
+
+    if not force_refresh:
+        cached = _TOKEN or _read_cached_token()
+        if cached and cached["expires_at"] - now > TOKEN_EXPIRY_SKEW:
+            _TOKEN = cached
+            return cached["access_token"]
 
-def get_adp_token():
     data = {
         "grant_type": "client_credentials",
         "client_id": CLIENT_ID,
         "client_secret": CLIENT_SECRET,
     }
-    resp = requests.post(
+    resp = session.post(
         ADP_TOKEN_URL,
         data=data,
         headers={"Content-Type": "application/x-www-form-urlencoded"},
-        cert=CERT,
     )
     resp.raise_for_status()
-    return resp.json()["access_token"]
+    payload = resp.json()
 
+    _TOKEN = {
+        "client_id": CLIENT_ID,
+        "access_token": payload["access_token"],
+        "expires_at": now + int(payload.get("expires_in", 3600)),
+    }
+    _write_cached_token(_TOKEN)
+    return _TOKEN["access_token"]
 
-def get_workers():
-    token = get_adp_token()
-    all_workers = []
-    offset = 0
-    limit = 50
 
+def fetch_page(session, token, offset, limit, query=None):
+    """
+    Fetch a single page of workers starting at `offset`.
+    `query` holds extra OData parameters such as $select / $filter.
+    """
+    resp = session.get(
+        ADP_WORKERS_URL,
+        params={"offset": offset, "limit": limit, **(query or {})},
+        headers={
+            "Accept": "application/json",
+            "Authorization": f"Bearer {token}",
+        },
+    )
+    resp.raise_for_status()
+    return _loads(resp.content).get("workers", [])
+
+
+def iter_workers(fields=None, status=None):
+    """
+    Yield ADP workers one at a time, in offset order.
+    Only the pages of the wave in flight are held in memory, never the full list.
+
+    Args:
+        fields: Optional OData paths (e.g. "workers/person/legalName") to
+            $select, so ADP only returns those parts of each worker
+        status: Optional workerStatus code (e.g. "Active") to $filter on
+    """
+    query = {}
+    if fields:
+        query["$select"] = ",".join(fields)
+    if status:
+        query["$filter"] = f"workers/workerStatus/statusCode/codeValue eq '{status}'"
+
+    # One session shared by the token call and all page threads
+    session = get_adp_session()
+    token = get_adp_token(session)
+    limit = ADP_PAGE_SIZE
+
+    # Probe the first page synchronously; small tenants are done after this.
+    # A 400 may be either the $select projection or the page size, so each
+    # is given up in turn, at most once, and the probe retried
+    refreshed = False
     while True:
-        url = f"{ADP_WORKERS_URL}?offset={offset}&limit={limit}"
-        resp = requests.get(
-            url,
-            headers={
-                "Accept": "application/json",
-                "Authorization": f"Bearer {token}",
-            },
-            cert=CERT,
-        )
-        resp.raise_for_status()
-        data = resp.json()
-        workers = data.get("workers", [])
-        all_workers.extend(workers)
-        if len(workers) < limit:
+        try:
+            workers = fetch_page(session, token, 0, limit, query)
             break
-        offset += limit
-
-    return {"workers": all_workers}
+        except requests.exceptions.HTTPError as e:
+            status_code = e.response.status_code if e.response is not None else None
+            if status_code == 401 and not refreshed:
+                # A cached token may have been revoked early; mint a fresh one once
+                token = get_adp_token(session, force_refresh=True)
+                refreshed = True
+            elif status_code == 400 and "$select" in query:
+                print("ADP rejected the $select projection; retrying without it")
+                query = {k: v for k, v in query.items() if k != "$select"}
+            elif status_code == 400 and limit > ADP_FALLBACK_PAGE_SIZE:
+                print(f"ADP rejected page size {limit}; retrying with {ADP_FALLBACK_PAGE_SIZE}")
+                limit = ADP_FALLBACK_PAGE_SIZE
+            else:
+                raise
+    yield from workers
+    if len(workers) < limit:
+        return
+    offset = limit
+
+    pool = ThreadPoolExecutor(max_workers=PAGE_FETCH_THREADS)
+    try:
+        wave = 1
+        while True:
+            futures = [
+                pool.submit(fetch_page, session, token, offset + i * limit, limit, query)
+                for i in range(wave)
+            ]
+            # Pages are consumed in offset order, regardless of completion order
+            for future in futures:
+                workers = future.result()
+                yield from workers
+                if len(workers) < limit:
+                    return
+            offset += wave * limit
+            wave = min(wave * 2, PAGE_WAVE)
+    finally:
+        # A short page ends the listing: drop queued pages past it
+        pool.shutdown(wait=True, cancel_futures=True)
+
+
+def get_workers(fields=None, status=None):
+    """
+    Fetch all workers into memory, for callers that need random access.
+    See iter_workers for `fields` / `status`.
+    """
+    return {"workers": list(iter_workers(fields=fields, status=status))}
 
 
 def print_worker_stats():
-    employees_data = get_workers()
-    workers = employees_data.get("workers", [])
-    total_employees = len(workers)
+    # Streamed: only counters and the role set are kept, not the workers
+    total_employees = 0
     active_count = 0
     terminated_count = 0
     active_roles_set = set()
 
-    for emp in workers:
-        status = (
-            emp.get("workerStatus", {})
-            .get("statusCode", {})
-            .get("codeValue", "Unknown")
-        )
+    add_role = active_roles_set.add
+    for emp in iter_workers(fields=STATS_FIELDS):
+        total_employees += 1
+        # Direct indexing is the fast path; missing/null levels fall to Unknown
+        try:
+            status = emp["workerStatus"]["statusCode"]["codeValue"]
+        except (KeyError, TypeError):
+            status = "Unknown"
+
         if status == "Active":
             active_count += 1
-            assignments = emp.get("workAssignments", [])
-            job_title = "Unknown"
-            if assignments:
-                job_title = assignments[0].get("jobTitle") or "Unknown"
-            active_roles_set.add(job_title)
+            assignments = emp.get("workAssignments")
+            add_role((assignments[0].get("jobTitle") if assignments else None) or "Unknown")
         elif status == "Terminated":
             terminated_count += 1
 
@@ -79,9 +272,10 @@ def print_worker_stats():
     print(f"Active employees: {active_count}")
     print(f"Terminated employees: {terminated_count}")
     print(f"Unique active roles: {len(active_roles_set)}")
-    print("Active employee roles:")
-    for role in sorted(active_roles_set):
-        print(f"  - {role}")
+    sys.stdout.write(
+        "Active employee roles:\n"
+        + "".join(f"  - {role}\n" for role in sorted(active_roles_set))
+    )
 
 
 def _extract_manager_id_from_assignment(work_assignment):
@@ -126,25 +320,121 @@ def _extract_manager_id_from_assignment(work_assignment):
     return None
 
 
-def _clean_email(raw):
-    """Normalize email strings: strip mailto:, angle brackets, spaces, lower-case."""
-    if not raw:
+# Per-shape pickers for a single reportsTo entry. Each returns the same value
+# _extract_manager_id_from_assignment would, or something falsy/raises when the
+# entry doesn't have that shape (callers then fall back to the generic path).
+def _pick_person_dict(reports_to):
+    return reports_to["person"]["associateOID"]
+
+
+def _pick_person_list(reports_to):
+    return reports_to["person"][0]["associateOID"]
+
+
+def _pick_direct_aoid(reports_to):
+    # A person-level OID would take precedence in the generic path
+    return None if reports_to.get("person") else reports_to["associateOID"]
+
+
+def _pick_position_dict(reports_to):
+    if reports_to.get("person") or reports_to.get("associateOID"):
+        return None
+    position = reports_to["positionID"]
+    return position.get("idValue") or position.get("positionID")
+
+
+def _pick_position_str(reports_to):
+    if reports_to.get("person") or reports_to.get("associateOID"):
         return None
-    s = str(raw).strip().lower()
+    position = reports_to["positionID"]
+    return position if isinstance(position, str) else None
+
 
-    # Strip mailto:
-    if s.startswith("mailto:"):
-        s = s[len("mailto:"):]
+_REPORTS_TO_PICKERS = {
+    "person_dict": _pick_person_dict,
+    "person_list": _pick_person_list,
+    "direct_aoid": _pick_direct_aoid,
+    "position_dict": _pick_position_dict,
+    "position_str": _pick_position_str,
+}
 
-    # Handle "Name <email@domain>" style
-    if "<" in s and "@" in s and ">" in s:
-        start = s.index("<") + 1
-        end = s.index(">", start)
-        inner = s[start:end].strip()
-        if "@" in inner:
-            s = inner.lower()
 
-    return s
+def _detect_reports_to_shape(work_assignment):
+    """
+    Classify how `reportsTo` is shaped in a sample workAssignment.
+    Returns (container, key) where container is "list" or "dict" and key is one
+    of _REPORTS_TO_PICKERS, or None if the shape isn't recognized.
+    """
+    reports_to = work_assignment.get("reportsTo")
+    container = "dict"
+    if isinstance(reports_to, list):
+        container = "list"
+        reports_to = reports_to[0] if reports_to else None
+    if not isinstance(reports_to, dict):
+        return None
+
+    person = reports_to.get("person")
+    position = reports_to.get("positionID")
+    if isinstance(person, dict) and person.get("associateOID"):
+        key = "person_dict"
+    elif (
+        isinstance(person, list)
+        and person
+        and isinstance(person[0], dict)
+        and person[0].get("associateOID")
+    ):
+        key = "person_list"
+    elif reports_to.get("associateOID"):
+        key = "direct_aoid"
+    elif isinstance(position, dict):
+        key = "position_dict"
+    elif isinstance(position, str):
+        key = "position_str"
+    else:
+        return None
+    return container, key
+
+
+def _specialize_manager_id_extractor(sample_work_assignment):
+    """
+    Return a manager-ID extractor specialized to the tenant's reportsTo shape,
+    as seen in `sample_work_assignment`. The shape is invariant within a tenant,
+    so the fast path is one or two lookups; any record that doesn't fit falls
+    back to _extract_manager_id_from_assignment.
+    """
+    shape = _detect_reports_to_shape(sample_work_assignment)
+    if shape is None:
+        return _extract_manager_id_from_assignment
+
+    container, key = shape
+    pick = _REPORTS_TO_PICKERS[key]
+    generic = _extract_manager_id_from_assignment
+
+    if container == "list":
+        def extract(work_assignment):
+            try:
+                return pick(work_assignment["reportsTo"][0]) or generic(work_assignment)
+            except (KeyError, IndexError, TypeError, AttributeError):
+                return generic(work_assignment)
+    else:
+        def extract(work_assignment):
+            try:
+                return pick(work_assignment["reportsTo"]) or generic(work_assignment)
+            except (KeyError, IndexError, TypeError, AttributeError):
+                return generic(work_assignment)
+
+    return extract
+
+
+def _clean_email(raw):
+    """
+    Normalize email strings: strip mailto:, angle brackets, spaces, lower-case.
+    Returns None if `raw` does not contain an address.
+    """
+    if not raw:
+        return None
+    m = _EMAIL_RE.match(str(raw))
+    return m.group(1).lower() if m else None
 
 
 def extract_email(worker):
@@ -192,88 +482,199 @@ def extract_email(worker):
     return None
 
 
-def find_worker_by_identifier(workers, identifier: str):
+def extract_work_email(worker):
     """
-    Try to locate a worker by an identifier, in this priority:
-    1) ADP user/worker IDs (often configured as work emails)
-    2) Full name / name fragment
-    3) Primary personal email (via extract_email)
-    4) Any other email-like string anywhere in the worker
+    Pull the work email from businessCommunication.emails[*].emailUri.
+    Returns the address stripped but otherwise as ADP has it, or None.
     """
-    target = identifier.strip().lower()
-
-    def get_full_name(worker):
-        person = worker.get("person", {}) or {}
-        legal = person.get("legalName", {}) or {}
-        first = (legal.get("givenName") or "").strip()
-        last = (legal.get("familyName") or "").strip()
-        return (first + " " + last).strip()
-
-    def get_candidate_ids(worker):
-        """
-        Collect all ID-like fields that might be configured as the 'user id'
-        (e.g., work email).
-        """
-        ids = []
-
-        # Common ADP fields
-        aoid = worker.get("associateOID")
-        if aoid:
-            ids.append(str(aoid))
-
-        w_id = (worker.get("workerID") or {}).get("idValue")
-        if w_id:
-            ids.append(str(w_id))
-
-        # Possible custom/user fields (depending on your tenant)
-        for key in ("userId", "userID", "login", "username"):
-            if key in worker:
-                ids.append(str(worker[key]))
-
-        return [i.strip().lower() for i in ids if i]
-
-    def iter_strings_with_at(obj):
-        if isinstance(obj, dict):
-            for v in obj.values():
-                yield from iter_strings_with_at(v)
-        elif isinstance(obj, list):
-            for v in obj:
-                yield from iter_strings_with_at(v)
-        elif isinstance(obj, str):
-            if "@" in obj:
-                yield obj
-
-    # 1) Try to match identifier against ID fields first
-    for w in workers:
-        for wid in get_candidate_ids(w):
-            if wid == target:
-                return w
+    bc = worker.get("businessCommunication", {}) or {}
+    emails = bc.get("emails", []) or []
+    if emails and isinstance(emails, list):
+        for email_obj in emails:
+            if isinstance(email_obj, dict):
+                email_uri = email_obj.get("emailUri")
+                if email_uri:
+                    return email_uri.strip()
 
-    # 2) Try to match by full name / fragment
-    for w in workers:
-        full_name = get_full_name(w)
-        if full_name and target in full_name.lower():
-            return w
+    return None
 
-    # 3) Try to match by primary email
-    for w in workers:
-        primary_email = extract_email(w)
-        if primary_email and target in primary_email.lower():
-            return w
 
-    # 4) Try to match by ANY email-like string inside the worker
+def _get_full_name(worker):
+    person = worker.get("person", {}) or {}
+    legal = person.get("legalName", {}) or {}
+    first = (legal.get("givenName") or "").strip()
+    last = (legal.get("familyName") or "").strip()
+    return (first + " " + last).strip()
+
+
+def _get_candidate_ids(worker):
+    """
+    Collect all ID-like fields that might be configured as the 'user id'
+    (e.g., work email).
+    """
+    ids = []
+
+    # Common ADP fields
+    aoid = worker.get("associateOID")
+    if aoid:
+        ids.append(str(aoid))
+
+    w_id = (worker.get("workerID") or {}).get("idValue")
+    if w_id:
+        ids.append(str(w_id))
+
+    # Possible custom/user fields (depending on your tenant)
+    for key in ("userId", "userID", "login", "username"):
+        if key in worker:
+            ids.append(str(worker[key]))
+
+    return [i.strip().casefold() for i in ids if i]
+
+
+def _iter_strings_with_at(obj):
+    """Yield every string containing "@" nested anywhere inside `obj`."""
+    # Explicit stack instead of recursive generators (one frame per level).
+    # Visit order differs from a recursive walk, which callers don't rely on.
+    stack = [obj]
+    while stack:
+        x = stack.pop()
+        if isinstance(x, dict):
+            stack.extend(x.values())
+        elif isinstance(x, list):
+            stack.extend(x)
+        elif isinstance(x, str) and "@" in x:
+            yield x
+
+
+def _worker_email_strings(worker):
+    """
+    Every email-like string in `worker`, cleaned and case-folded. Computed on
+    first use and kept on the worker under "_all_emails_lc".
+    """
+    emails = worker.get("_all_emails_lc")
+    if emails is None:
+        emails = worker["_all_emails_lc"] = tuple(
+            (_clean_email(s) or s.strip()).casefold() for s in _iter_strings_with_at(worker)
+        )
+    return emails
+
+
+def _flatten_worker(worker, manager_id_of=_extract_manager_id_from_assignment):
+    """
+    Compute the fields the lookup/traversal loops need once and store them on
+    the worker dict under "_"-prefixed keys. Safe to call more than once.
+    `manager_id_of` extracts the manager ID from a workAssignment.
+    """
+    if "_aoid" in worker:
+        return worker
+
+    wa = worker.get("workAssignments", []) or []
+    worker["_aoid"] = worker.get("associateOID") or (
+        worker.get("workerID") or {}
+    ).get("idValue")
+    worker["_manager_id"] = manager_id_of(wa[0]) if wa else None
+    worker["_full_name"] = _get_full_name(worker)
+    worker["_title"] = (wa[0].get("jobTitle") if wa else None) or "Unknown"
+    worker["_email_lc"] = (extract_email(worker) or "").lower()
+    worker["_work_email_lc"] = (extract_work_email(worker) or "").lower()
+    return worker
+
+
+def build_worker_indexes(workers):
+    """
+    Index workers for identifier lookups in a single pass.
+    Keys are case-folded here, once, so lookups only fold the identifier.
+    Returns:
+        id_map: case-folded ID field -> worker
+        name_map: case-folded full name -> worker
+        email_map: case-folded work or primary email -> worker
+    When several workers share a key the first one wins, as with a linear scan.
+    """
+    id_map = {}
+    name_map = {}
+    email_map = {}
+
     for w in workers:
-        for s in iter_strings_with_at(w):
-            cleaned = _clean_email(s) or s.strip().lower()
-            if target in cleaned:
+        _flatten_worker(w)
+
+        for wid in _get_candidate_ids(w):
+            id_map.setdefault(wid, w)
+
+        full_name = w["_full_name"].casefold()
+        if full_name:
+            name_map.setdefault(full_name, w)
+
+        if w["_work_email_lc"]:
+            email_map.setdefault(w["_work_email_lc"].casefold(), w)
+        if w["_email_lc"]:
+            email_map.setdefault(w["_email_lc"].casefold(), w)
+
+    return id_map, name_map, email_map
+
+
+class WorkerDirectory:
+    """A workers list plus lookup indexes, built once and reused across lookups."""
+
+    def __init__(self, workers):
+        self.workers = workers
+        self.id_map, self.name_map, self.email_map = build_worker_indexes(workers)
+
+    def find(self, identifier: str):
+        """See find_worker_by_identifier."""
+        target = identifier.strip().casefold()
+
+        # 1) Exact ID / work or primary email / full name: hashed lookups
+        worker = (
+            self.id_map.get(target)
+            or self.email_map.get(target)
+            or self.name_map.get(target)
+        )
+        if worker:
+            return worker
+
+        # 2) Name fragment (dicts keep first-seen order, so list order is kept);
+        #    names never contain "@", so email identifiers skip straight to 3)
+        if "@" not in target:
+            for full_name, w in self.name_map.items():
+                if target in full_name:
+                    return w
+
+        # 3) Work or primary email fragment
+        for email, w in self.email_map.items():
+            if target in email:
                 return w
 
-    return None
+        # 4) ANY email-like string inside the worker
+        for w in self.workers:
+            for email in _worker_email_strings(w):
+                if target in email:
+                    return w
+
+        return None
+
+
+def find_worker_by_identifier(workers, identifier: str):
+    """
+    Try to locate a worker by an identifier, in this priority:
+    1) Exact ADP user/worker ID (often configured as work email),
+       work email, primary email, or full name
+    2) Full name fragment
+    3) Work email or primary personal email fragment
+    4) Any other email-like string anywhere in the worker
+
+    `workers` may be a list or a WorkerDirectory; pass a WorkerDirectory
+    when doing several lookups so the indexes are only built once.
+    """
+    if not isinstance(workers, WorkerDirectory):
+        workers = WorkerDirectory(workers)
+    return workers.find(identifier)
 
 
 def build_org_hierarchy(workers):
     """
     Build a mapping of manager -> list of direct reports.
+    Also precomputes _aoid/_manager_id/_full_name/_title/_email_lc on every
+    worker (see _flatten_worker) so later traversals read flat keys.
     Returns:
         manager_map: dict of manager_associateOID -> list of worker dicts
         worker_map: dict of associateOID -> worker dict
@@ -281,65 +682,65 @@ def build_org_hierarchy(workers):
     manager_map = {}
     worker_map = {}
 
-    # First pass: index workers by associateOID or workerID.idValue
+    # Sniff the tenant's reportsTo shape once, from the first worker that has one
+    manager_id_of = _extract_manager_id_from_assignment
     for w in workers:
-        aoid = w.get("associateOID") or (w.get("workerID") or {}).get("idValue")
-        if not aoid:
-            continue
-        worker_map[aoid] = w
+        wa = w.get("workAssignments") or []
+        if wa and wa[0].get("reportsTo"):
+            manager_id_of = _specialize_manager_id_extractor(wa[0])
+            break
 
-    # Second pass: connect each worker to their manager
+    # Single pass: flatten each worker, index it, and attach it to its manager
     for w in workers:
-        aoid = w.get("associateOID") or (w.get("workerID") or {}).get("idValue")
+        aoid = _flatten_worker(w, manager_id_of)["_aoid"]
         if not aoid:
             continue
+        worker_map[aoid] = w
 
-        work_assignments = w.get("workAssignments", []) or []
-        manager_id = None
-        if work_assignments:
-            manager_id = _extract_manager_id_from_assignment(work_assignments[0])
-
-        if manager_id:
-            manager_map.setdefault(manager_id, []).append(w)
-        else:
-            # Top-level employees (no manager)
-            manager_map.setdefault(None, []).append(w)
+        # Top-level employees (no manager) are filed under None
+        manager_map.setdefault(w["_manager_id"] or None, []).append(w)
 
     return manager_map, worker_map
 
 
 def is_active_worker(worker):
     """Check if a worker has an 'Active' status."""
-    status = (
-        worker.get("workerStatus", {})
-        .get("statusCode", {})
-        .get("codeValue", "Unknown")
-    )
-    return status == "Active"
+    try:
+        return worker["workerStatus"]["statusCode"]["codeValue"] == "Active"
+    except (KeyError, TypeError):
+        return False
 
 
 def print_org_tree(manager_map, worker_map, manager_id=None, indent=0):
-    """Recursively print the org tree (active employees only)."""
-    employees = manager_map.get(manager_id, [])
-    for emp in employees:
-        # Skip non-active employees
+    """
+    Print the org tree (active employees only) depth-first, in a single write.
+    Expects workers flattened by build_org_hierarchy.
+    """
+    lines = []
+    visited = set()
+
+    # Explicit DFS stack; children are pushed reversed so they pop in order
+    stack = [(emp, indent) for emp in reversed(manager_map.get(manager_id, []))]
+    while stack:
+        emp, depth = stack.pop()
+
+        # Skip non-active employees (and everyone under them)
         if not is_active_worker(emp):
             continue
 
-        aoid = emp.get("associateOID") or (emp.get("workerID") or {}).get("idValue")
-        name = emp.get("person", {}).get("legalName", {}).get("givenName", "Unknown")
-        family = emp.get("person", {}).get("legalName", {}).get("familyName", "")
-        full_name = f"{name} {family}".strip()
+        aoid = emp["_aoid"]
+        lines.append(" " * depth + f"- {emp['_full_name'] or 'Unknown'} ({emp['_title']})")
 
-        title = "Unknown"
-        wa = emp.get("workAssignments", [])
-        if wa:
-            title = wa[0].get("jobTitle") or "Unknown"
-
-        print(" " * indent + f"- {full_name} ({title})")
+        # Descend into direct reports once per manager, so a reporting cycle
+        # in the ADP data cannot loop forever
+        if aoid is None or aoid in visited:
+            continue
+        visited.add(aoid)
+        reports = manager_map.get(aoid, [])
+        stack.extend((report, depth + 4) for report in reversed(reports))
 
-        # Recurse into direct reports
-        print_org_tree(manager_map, worker_map, aoid, indent + 4)
+    if lines:
+        sys.stdout.write("\n".join(lines) + "\n")
 
 
 def print_org_chart(manager_identifier: str | None = None):
@@ -348,7 +749,8 @@ def print_org_chart(manager_identifier: str | None = None):
     If manager_identifier is provided, only prints that manager's subtree.
     """
     print("Fetching workers from ADP...")
-    data = get_workers()
+    # Identifier lookups need IDs/emails, so only project the full-chart case
+    data = get_workers(fields=None if manager_identifier else ORG_CHART_FIELDS)
     workers = data.get("workers", [])
 
     if not workers:
@@ -364,9 +766,7 @@ def print_org_chart(manager_identifier: str | None = None):
             print(f"Could not find any worker matching: {manager_identifier}")
             return
 
-        manager_id = manager_worker.get("associateOID") or (
-            manager_worker.get("workerID") or {}
-        ).get("idValue")
+        manager_id = manager_worker["_aoid"]
 
         if not manager_id:
             print(
@@ -375,16 +775,8 @@ def print_org_chart(manager_identifier: str | None = None):
             return
 
         # Print who we're scoping under
-        person = manager_worker.get("person", {})
-        legal_name = person.get("legalName", {}) or {}
-        first = legal_name.get("givenName", "Unknown")
-        last = legal_name.get("familyName", "")
-        full_name = f"{first} {last}".strip()
-
-        title = "Unknown"
-        wa = manager_worker.get("workAssignments", []) or []
-        if wa:
-            title = wa[0].get("jobTitle") or "Unknown"
+        full_name = manager_worker["_full_name"] or "Unknown"
+        title = manager_worker["_title"]
 
         print(
             f"\n=== ORG CHART UNDER {full_name} ({title}) [{manager_identifier}] ===\n"
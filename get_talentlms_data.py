@@ -7,8 +7,18 @@ by fetching and displaying user information.
 
 import requests
 import json
+import sys
+from concurrent.futures import ThreadPoolExecutor
+from requests.adapters import HTTPAdapter
 from typing import Dict, List, Optional
 from config import DOMAIN, API_KEY
+from http_retry import RETRY_POLICY
+
+try:
+    import orjson  # optional, faster on the full /users payload
+    _loads = orjson.loads
+except ImportError:
+    _loads = json.loads
 
 
 class TalentLMSClient:
@@ -22,6 +32,25 @@ class TalentLMSClient:
         self.base_url = f"https://{self.domain}/api/v1"
         self.api_key = api_key
 
+        # Keep-alive pool so repeated calls reuse the same TLS connection
+        self.session = requests.Session()
+        self.session.auth = (api_key, '')  # API key as username, empty password
+        self.session.mount("https://", HTTPAdapter(
+            pool_connections=4,
+            pool_maxsize=16,
+            max_retries=RETRY_POLICY
+        ))
+
+    def close(self) -> None:
+        """Close pooled connections held by the client's session"""
+        self.session.close()
+
+    def __enter__(self) -> "TalentLMSClient":
+        return self
+
+    def __exit__(self, exc_type, exc, tb) -> None:
+        self.close()
+
     def _make_request(self, endpoint: str, method: str = 'GET', data: Optional[Dict] = None) -> Dict:
         """
         Make an authenticated request to TalentLMS API
@@ -37,15 +66,14 @@ class TalentLMSClient:
         url = f"{self.base_url}{endpoint}"
 
         try:
-            response = requests.request(
+            response = self.session.request(
                 method=method,
                 url=url,
-                auth=(self.api_key, ''),  # API key as username, empty password
                 data=data,
                 headers={'Content-Type': 'application/x-www-form-urlencoded'}
             )
             response.raise_for_status()
-            return response.json()
+            return _loads(response.content)
 
         except requests.exceptions.HTTPError as e:
             print(f"HTTP Error: {e}")
@@ -89,14 +117,14 @@ def display_users_summary(users: List[Dict]) -> None:
     """
     print(f"Total Users: {len(users)}\n")
 
-    print(f"{'ID':<10} {'First Name':<15} {'Last Name':<15} {'Email':<25}")
-
+    # Build every row first, then write them in one call
+    row = "{:<10} {:<15} {:<15} {:<25}".format
+    lines = [row('ID', 'First Name', 'Last Name', 'Email')]
     for user in users[:10]:  # Display first 10 users
-        user_id = user.get('id', 'N/A')
-        first_name = user.get('first_name', 'N/A')
-        last_name = user.get('last_name', 'N/A')
-        email = user.get('email', 'N/A')
-        print(f"{user_id:<10} {first_name:<15} {last_name:<15} {email:<25}")
+        g = user.get
+        lines.append(row(g('id', 'N/A'), g('first_name', 'N/A'),
+                         g('last_name', 'N/A'), g('email', 'N/A')))
+    sys.stdout.write("\n".join(lines) + "\n")
 
     if len(users) > 10:
         print(f"\n... and {len(users) - 10} more users")
@@ -114,8 +142,7 @@ def display_first_names(users: List[Dict]) -> None:
 
     first_names = [user.get('first_name', 'Unknown') for user in users]
 
-    for i, name in enumerate(first_names, 1):
-        print(f"{i}. {name}")
+    sys.stdout.write("".join(f"{i}. {name}\n" for i, name in enumerate(first_names, 1)))
 
     print(f"\nTotal: {len(first_names)} users")
 
@@ -126,12 +153,19 @@ def main():
     # Use credentials from config file
     # DOMAIN and API_KEY are imported
     client = TalentLMSClient(DOMAIN, API_KEY)
+    pool = ThreadPoolExecutor(max_workers=1)
 
     try:
         # Retrieve all users
         print("\nFetching users from TalentLMS...")
         users = client.get_users()
 
+        # Start fetching the first user's details while the summaries print
+        first_user_id = users[0].get('id') if users else None
+        detail_future = None
+        if isinstance(first_user_id, int):
+            detail_future = pool.submit(client.get_user_by_id, first_user_id)
+
         # Display users summary
         display_users_summary(users)
 
@@ -140,10 +174,9 @@ def main():
 
         # Optional: Get details of the first user
         if users:
-            first_user_id = users[0].get('id')
-            if isinstance(first_user_id, int):
+            if detail_future is not None:
                 print(f"\nFetching detailed information for user ID {first_user_id}...")
-                user_detail = client.get_user_by_id(first_user_id)
+                user_detail = detail_future.result()
                 print(f"\nDetailed User Information:")
                 print(json.dumps(user_detail, indent=2))
             else:
@@ -158,6 +191,10 @@ def main():
         print("2. Your API key is valid")
         print("3. Your TalentLMS account has API access enabled")
 
+    finally:
+        pool.shutdown()
+        client.close()
+
 
 if __name__ == "__main__":
     main()
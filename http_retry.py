@@ -0,0 +1,36 @@
+"""
+Retry policy shared by the ADP and TalentLMS sessions.
+"""
+
+from urllib3.util.retry import Retry
+
+
+class _RetryPolicy(Retry):
+    """
+    Retry that replays POST only on 429. A rate-limited request was never
+    processed, but a 5xx can arrive after TalentLMS already created, enrolled
+    or deleted a user, and those calls are not safe to repeat.
+    """
+
+    def is_retry(self, method: str, status_code: int, has_retry_after: bool = False) -> bool:
+        if method.upper() == "POST":
+            return status_code == 429
+        return super().is_retry(method, status_code, has_retry_after)
+
+
+# Transient failures (rate limits, gateway errors) are retried with capped,
+# jittered exponential backoff; a Retry-After header takes precedence.
+# POST is not in allowed_methods, so a dropped response is never replayed;
+# _RetryPolicy still retries it on 429. Once retries run out the last response
+# is returned, so raise_for_status() gives callers an HTTPError carrying its
+# status and body rather than a bare RetryError.
+RETRY_POLICY = _RetryPolicy(
+    total=5,
+    backoff_factor=0.5,
+    backoff_max=10,
+    backoff_jitter=0.5,
+    status_forcelist=[429, 500, 502, 503, 504],
+    allowed_methods=frozenset(["GET", "DELETE"]),
+    respect_retry_after_header=True,
+    raise_on_status=False,
+)
@@ -6,15 +6,100 @@ This program imports new employees into TalentLMS and optionally assigns them to
 
 import requests
 import json
+from requests.adapters import HTTPAdapter
 import csv
-from typing import Dict, List, Optional
+import sys
+import threading
+import time
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+from contextlib import contextmanager
+from dataclasses import asdict, dataclass, field
+from typing import Collection, Dict, Iterable, List, Optional
 from datetime import datetime
 from config import DOMAIN, API_KEY
+from http_retry import RETRY_POLICY
+
+# How many employees are imported at once (bounded to respect rate limits)
+IMPORT_CONCURRENCY = 10
+
+# How many course enrollments run at once for a single user; with
+# IMPORT_CONCURRENCY this stays within the session's connection pool
+COURSE_ENROLL_CONCURRENCY = 3
+
+# Progress lines from concurrent imports are written in batches of this many employees
+PROGRESS_FLUSH_EVERY = 50
+
+# How long a get_users() result is reused before refetching
+USERS_CACHE_TTL = 60  # seconds
+
+_MISSING = object()  # cache sentinel, distinct from a cached None
+
+try:
+    import orjson  # optional, faster JSON decoding and encoding
+    _loads = orjson.loads
+
+    def _dumps_indented(obj) -> bytes:
+        return orjson.dumps(obj, option=orjson.OPT_INDENT_2)  # dataclasses serialize natively
+except ImportError:
+    _loads = json.loads
+
+    def _dumps_indented(obj) -> bytes:
+        return json.dumps(obj, indent=2, default=asdict).encode('utf-8')
+
+
+# Per-thread buffer for diagnostics; see _emit() and _capture_output()
+_output = threading.local()
+
+
+def _emit(text: str) -> None:
+    """
+    Write diagnostic text to the current thread's captured progress lines,
+    so it stays with the employee being imported, or to stdout otherwise
+    """
+    lines = getattr(_output, 'lines', None)
+    if lines is not None:
+        lines.append(text)
+    else:
+        sys.stdout.write(text)
+
+
+@contextmanager
+def _capture_output(lines: Optional[List[str]]):
+    """Send _emit() calls made on this thread to `lines` for the duration"""
+    previous = getattr(_output, 'lines', None)
+    _output.lines = lines
+    try:
+        yield
+    finally:
+        _output.lines = previous
+
+
+def _unique_rows(rows: Iterable[Dict], duplicates: List[str]) -> Iterable[Dict]:
+    """
+    Yield rows with string fields stripped, dropping any row whose email
+    (case-insensitive) was already seen. Dropped emails are appended to
+    `duplicates`. Rows without an email are passed through unchanged.
+    """
+    seen = set()
+    for row in rows:
+        row = {k: v.strip() if isinstance(v, str) else v for k, v in row.items()}
+        email = (row.get('email') or '').lower()
+        if email:
+            if email in seen:
+                duplicates.append(row['email'])
+                continue
+            seen.add(email)
+        yield row
 
 
 class TalentLMSClient:
     """Client for interacting with TalentLMS API"""
 
+    __slots__ = (
+        'domain', 'base_url', 'api_key', 'session',
+        '_users_cache', '_users_cache_ts', '_users_by_email', '_user_cache'
+    )
+
     def __init__(self, domain: str, api_key: str):
         """
         Initialize the TalentLMS client
@@ -27,14 +112,45 @@ class TalentLMSClient:
         self.base_url = f"https://{self.domain}/api/v1"
         self.api_key = api_key
 
-    def _make_request(self, endpoint: str, method: str = 'GET', data: Optional[Dict] = None) -> Dict:
+        # Keep-alive pool so repeated calls reuse the same TLS connection;
+        # sized so concurrent imports don't churn connections
+        self.session = requests.Session()
+        self.session.auth = (api_key, '')  # API key as username, empty password
+        self.session.headers['Accept'] = 'application/json'
+        self.session.mount("https://", HTTPAdapter(
+            pool_connections=4,
+            pool_maxsize=32,
+            max_retries=RETRY_POLICY
+        ))
+
+        # In-process caches of get_users() and get_user_by_email(),
+        # cleared by invalidate()
+        self._users_cache: Optional[List[Dict]] = None
+        self._users_cache_ts = 0.0
+        self._users_by_email: Dict[str, Dict] = {}
+        self._user_cache: Dict[str, Optional[Dict]] = {}  # None = known missing
+
+    def close(self) -> None:
+        """Close pooled connections held by the client's session"""
+        self.session.close()
+
+    def __enter__(self) -> "TalentLMSClient":
+        return self
+
+    def __exit__(self, exc_type, exc, tb) -> None:
+        self.close()
+
+    def _make_request(self, endpoint: str, method: str = 'GET', data: Optional[Dict] = None,
+                      expected_statuses: Collection[int] = ()) -> Dict:
         """
         Make an authenticated request to TalentLMS API
 
         Args:
             endpoint: API endpoint
             method: HTTP method
-            data: Request payload
+            data: Request payload, sent form-encoded as the v1 API expects
+            expected_statuses: Error statuses the caller handles itself;
+                these are raised without being reported
 
         Returns:
             JSON response as dictionary
@@ -42,27 +158,29 @@ class TalentLMSClient:
         url = f"{self.base_url}{endpoint}"
 
         try:
-            response = requests.request(
+            response = self.session.request(
                 method=method,
                 url=url,
-                auth=(self.api_key, ''),
                 data=data
             )
             response.raise_for_status()
-            return response.json()
+            return _loads(response.content)
 
         except requests.exceptions.HTTPError as e:
-            print(f"HTTP Error: {e}")
+            if e.response is not None and e.response.status_code in expected_statuses:
+                raise
+            _emit(f"HTTP Error: {e}\n")
             if hasattr(e.response, 'text'):
-                print(f"Response: {e.response.text}")
+                _emit(f"Response: {e.response.text}\n")
             raise
         except requests.exceptions.RequestException as e:
-            print(f"Request Error: {e}")
+            _emit(f"Request Error: {e}\n")
             raise
 
     def create_user(self, first_name: str, last_name: str, email: str,
                     login: str, password: Optional[str] = None,
-                    user_type: Optional[str] = None) -> Dict:
+                    user_type: Optional[str] = None,
+                    expected_statuses: Collection[int] = ()) -> Dict:
         """
         Create a new user in TalentLMS
 
@@ -73,6 +191,8 @@ class TalentLMSClient:
             login: Username for login
             password: Password (optional, TalentLMS will generate if not provided)
             user_type: User type (Learner, Instructor, Administrator - optional, defaults to Learner if not provided)
+            expected_statuses: Error statuses the caller handles itself (e.g.
+                a duplicate account), raised without being reported
 
         Returns:
             Created user dictionary
@@ -90,7 +210,12 @@ class TalentLMSClient:
         if user_type:
             data['user_type'] = user_type
 
-        return self._make_request('/usersignup', method='POST', data=data)
+        created = self._make_request('/usersignup', method='POST', data=data,
+                                     expected_statuses=expected_statuses)
+        # The users list is stale now, but this email's lookup result is known
+        self._users_cache = None
+        self._user_cache[email.strip().lower()] = created
+        return created
 
     def add_user_to_course(self, user_id: int, course_id: int, role: str = "learner") -> Dict:
         """
@@ -127,36 +252,85 @@ class TalentLMSClient:
     def get_users(self) -> List[Dict]:
         """
         Retrieve all users from TalentLMS
+        Results are reused for USERS_CACHE_TTL seconds.
 
         Returns:
             List of user dictionaries
         """
+        cached = self._fresh_users()
+        if cached is not None:
+            return cached
+
         result = self._make_request('/users')
         if isinstance(result, dict):
-            return [result]
+            result = [result]
+
+        users_by_email = {}
+        for user in result:
+            email = user.get('email')
+            if email:
+                users_by_email.setdefault(email.strip().lower(), user)
+
+        self._users_cache = result
+        self._users_cache_ts = time.monotonic()
+        self._users_by_email = users_by_email
         return result
 
-    def get_user_by_email(self, email: str) -> Optional[Dict]:
+    def _fresh_users(self) -> Optional[List[Dict]]:
+        """The cached get_users() result, or None if missing or expired"""
+        users, fetched_at = self._users_cache, self._users_cache_ts
+        if users is not None and time.monotonic() - fetched_at < USERS_CACHE_TTL:
+            return users
+        return None
+
+    def invalidate(self) -> None:
+        """Drop cached user data so the next lookup goes to the API"""
+        self._users_cache = None
+        self._users_cache_ts = 0.0
+        self._users_by_email = {}
+        self._user_cache = {}
+
+    def get_user_by_email(self, email: str, refresh: bool = False) -> Optional[Dict]:
         """
         Check if a user exists by email
+        Results, including "not found", are cached per email for the
+        lifetime of the client.
 
         Args:
             email: Email to search for
+            refresh: Ignore cached results and ask the API again
 
         Returns:
             User dictionary if found, None otherwise
         """
+        key = email.strip().lower()
+
+        if not refresh:
+            cached = self._user_cache.get(key, _MISSING)
+            if cached is not _MISSING:
+                return cached
+
+            # Served from a fresh get_users() result when possible
+            if self._fresh_users() is not None:
+                listed = self._users_by_email.get(key)
+                if listed:
+                    return listed
+
         try:
-            return self._make_request(f'/users/email:{email}')
+            user = self._make_request(f'/users/email:{email}', expected_statuses=(404,))
         except requests.exceptions.HTTPError as e:
             # 404 is expected when user doesn't exist
             if e.response.status_code == 404:
-                return None
-            # Re-raise other HTTP errors
-            raise
+                user = None
+            else:
+                # Re-raise other HTTP errors
+                raise
         except:
             return None
-        
+
+        self._user_cache[key] = user
+        return user
+
     def delete_user(
         self,
         user_id: int,
@@ -184,76 +358,177 @@ class TalentLMSClient:
         if permanent:
             data["permanent"] = "yes"
 
-        return self._make_request("/deleteuser", method="POST", data=data)
+        response = self._make_request("/deleteuser", method="POST", data=data)
+        self.invalidate()
+        return response
+
+
+@dataclass(slots=True)
+class ImportResult:
+    """Outcome of importing one employee, as recorded in the import log"""
+    email: Optional[str]
+    status: str = 'pending'
+    user_id: Optional[int] = None
+    errors: List[str] = field(default_factory=list)
+    courses_assigned: List[int] = field(default_factory=list)
 
 
 class EmployeeImporter:
     """Handles importing employees into TalentLMS"""
 
-    def __init__(self, client: TalentLMSClient):
+    __slots__ = ('client', 'max_workers', 'import_log', '_existing_by_email')
+
+    def __init__(self, client: TalentLMSClient, max_workers: int = IMPORT_CONCURRENCY):
+        """
+        Args:
+            client: TalentLMS client used for all API calls
+            max_workers: How many employees to import concurrently
+        """
         self.client = client
-        self.import_log = []
+        self.max_workers = max_workers
+        self.import_log: List[Optional[ImportResult]] = []
+        # email.lower() -> existing TalentLMS user, filled by _prefetch_existing_users()
+        self._existing_by_email: Optional[Dict[str, Dict]] = None
 
-    def import_employee(self, employee: Dict, courses_to_assign: Optional[List[int]] = None) -> Dict:
+    def _prefetch_existing_users(self) -> None:
+        """
+        Fetch every TalentLMS user once so create-vs-skip is decided
+        locally instead of with one lookup per employee. On failure the
+        importer creates users optimistically instead (see
+        _existing_user_for_duplicate).
+        """
+        if self._existing_by_email is not None:
+            return
+        try:
+            users = self.client.get_users()
+        except Exception as e:
+            _emit(f"Could not prefetch existing users, detecting duplicates on signup: {e}\n")
+            return
+        self._existing_by_email = {
+            u['email'].strip().lower(): u
+            for u in users if isinstance(u, dict) and u.get('email')
+        }
+
+    def _existing_user_for_duplicate(self, error: requests.exceptions.HTTPError,
+                                     email: str) -> Dict:
+        """
+        The existing user behind a /usersignup failure caused by a duplicate
+        account. Re-raises `error` if it is any other failure, or if no user
+        with this email can be found (e.g. only the login collided).
+        """
+        response = error.response
+        if response is None or response.status_code >= 500:
+            raise error  # already reported by _make_request
+        if 'already' in response.text.lower():
+            user = self.client.get_user_by_email(email, refresh=True)
+            if user:
+                return user
+        # 4xx signup errors are not reported by _make_request on this path
+        _emit(f"HTTP Error: {error}\nResponse: {response.text}\n")
+        raise error
+
+    def import_employee(self, employee: Dict, courses_to_assign: Optional[List[int]] = None) -> ImportResult:
         """
         Import a single employee
+        Progress lines are written to stdout in one call on return.
 
         Args:
             employee: Dictionary with employee data (first_name, last_name, email, login)
             courses_to_assign: Optional list of course IDs to enroll the user in
 
         Returns:
-            Dictionary with import result
-        """
-        result = {
-            'email': employee.get('email'),
-            'status': 'pending',
-            'user_id': None,
-            'errors': [],
-            'courses_assigned': []
-        }
+            ImportResult for the employee
+        """
+        lines: List[str] = []
+        result = self._import_one(employee, courses_to_assign, lines)
+        self.import_log.append(result)
+        sys.stdout.write("".join(lines))
+        return result
 
-        try:
-            # Check if user already exists
-            existing_user = self.client.get_user_by_email(employee['email'])
-
-            if existing_user:
-                result['status'] = 'skipped'
-                result['user_id'] = existing_user.get('id')
-                result['errors'].append('User already exists')
-                print(f"  ⚠ User {employee['email']} already exists (ID: {result['user_id']})")
-            else:
-                # Create new user
-                new_user = self.client.create_user(
-                    first_name=employee['first_name'],
-                    last_name=employee['last_name'],
-                    email=employee['email'],
-                    login=employee.get('login', employee['email']),
-                    password=employee.get('password'),
-                    user_type=employee.get('user_type')
-                )
-
-                result['user_id'] = new_user.get('id')
-                result['status'] = 'success'
-                print(f"  ✓ Created user {employee['email']} (ID: {result['user_id']})")
-
-            # Assign courses if specified
-            if courses_to_assign and result['user_id']:
-                for course_id in courses_to_assign:
+    def _import_one(self, employee: Dict, courses_to_assign: Optional[List[int]],
+                    lines: List[str]) -> ImportResult:
+        """
+        Import one employee without recording it in import_log. Progress
+        lines and client diagnostics raised meanwhile go to `lines`.
+        """
+        with _capture_output(lines):
+            result = ImportResult(email=employee.get('email'))
+
+            try:
+                # Existing users are known up front when the user list was
+                # prefetched; otherwise create optimistically and let a duplicate
+                # signup error identify them, saving a lookup per new user
+                existing_user = None
+                if self._existing_by_email is not None:
+                    existing_user = self._existing_by_email.get(employee['email'].strip().lower())
+
+                if not existing_user:
                     try:
-                        self.client.add_user_to_course(result['user_id'], course_id)
-                        result['courses_assigned'].append(course_id)
-                        print(f"    → Enrolled in course {course_id}")
-                    except Exception as e:
-                        result['errors'].append(f"Failed to assign course {course_id}: {str(e)}")
+                        new_user = self.client.create_user(
+                            first_name=employee['first_name'],
+                            last_name=employee['last_name'],
+                            email=employee['email'],
+                            login=employee.get('login', employee['email']),
+                            password=employee.get('password'),
+                            user_type=employee.get('user_type'),
+                            expected_statuses=range(400, 500)
+                        )
+                    except requests.exceptions.HTTPError as e:
+                        existing_user = self._existing_user_for_duplicate(e, employee['email'])
+
+                if existing_user:
+                    result.status = 'skipped'
+                    result.user_id = existing_user.get('id')
+                    result.errors.append('User already exists')
+                    lines.append(f"  ⚠ User {employee['email']} already exists (ID: {result.user_id})\n")
+                else:
+                    if self._existing_by_email is not None:
+                        self._existing_by_email[employee['email'].strip().lower()] = new_user
+
+                    result.user_id = new_user.get('id')
+                    result.status = 'success'
+                    lines.append(f"  ✓ Created user {employee['email']} (ID: {result.user_id})\n")
+
+                # Assign courses if specified
+                if courses_to_assign and result.user_id:
+                    errors = self._enroll(result.user_id, courses_to_assign)
+                    for course_id, e in zip(courses_to_assign, errors):
+                        if e is None:
+                            result.courses_assigned.append(course_id)
+                            lines.append(f"    → Enrolled {employee['email']} in course {course_id}\n")
+                        else:
+                            result.errors.append(f"Failed to assign course {course_id}: {str(e)}")
+
+            except Exception as e:
+                result.status = 'failed'
+                result.errors.append(str(e))
+                lines.append(f"  ✗ Failed to import {employee['email']}: {str(e)}\n")
+
+            return result
+
+    def _enroll(self, user_id: int, course_ids: List[int]) -> List[Optional[Exception]]:
+        """
+        Enroll a user in each course, concurrently when there are several
 
-        except Exception as e:
-            result['status'] = 'failed'
-            result['errors'].append(str(e))
-            print(f"  ✗ Failed to import {employee['email']}: {str(e)}")
+        Returns:
+            One entry per course, in order: None on success, otherwise
+            the exception raised
+        """
+        # Enrollment threads report into the calling employee's lines
+        lines = getattr(_output, 'lines', None)
+
+        def enroll(course_id):
+            with _capture_output(lines):
+                try:
+                    self.client.add_user_to_course(user_id, course_id)
+                except Exception as e:
+                    return e
+            return None
 
-        self.import_log.append(result)
-        return result
+        if len(course_ids) == 1:
+            return [enroll(course_ids[0])]
+        with ThreadPoolExecutor(max_workers=min(len(course_ids), COURSE_ENROLL_CONCURRENCY)) as pool:
+            return list(pool.map(enroll, course_ids))
 
     def import_from_csv(self, csv_file_path: str, courses_to_assign: Optional[List[int]] = None) -> Dict:
         """
@@ -276,22 +551,15 @@ class EmployeeImporter:
             'failed': 0
         }
 
+        duplicates = []
+
         try:
+            # Rows are read as the pool frees up, so parsing overlaps the API calls
             with open(csv_file_path, 'r', encoding='utf-8') as file:
-                reader = csv.DictReader(file)
-
-                for row in reader:
-                    summary['total'] += 1
-                    print(f"\n[{summary['total']}] Processing {row.get('email', 'N/A')}...")
-
-                    result = self.import_employee(row, courses_to_assign)
-
-                    if result['status'] == 'success':
-                        summary['success'] += 1
-                    elif result['status'] == 'skipped':
-                        summary['skipped'] += 1
-                    else:
-                        summary['failed'] += 1
+                rows = _unique_rows(csv.DictReader(file), duplicates)
+                self._import_many(rows, courses_to_assign, summary)
+            if duplicates:
+                print(f"\nIgnored {len(duplicates)} duplicate row(s): {', '.join(duplicates)}")
 
         except FileNotFoundError:
             print(f"Error: CSV file not found at {csv_file_path}")
@@ -321,19 +589,93 @@ class EmployeeImporter:
             'failed': 0
         }
 
-        for i, employee in enumerate(employees, 1):
-            print(f"\n[{i}/{len(employees)}] Processing {employee.get('email', 'N/A')}...")
+        self._import_many(employees, courses_to_assign, summary, total=len(employees))
 
-            result = self.import_employee(employee, courses_to_assign)
+        return summary
 
-            if result['status'] == 'success':
-                summary['success'] += 1
-            elif result['status'] == 'skipped':
-                summary['skipped'] += 1
-            else:
-                summary['failed'] += 1
+    def _import_many(self, employees: Iterable[Dict], courses_to_assign: Optional[List[int]],
+                     summary: Dict, total: Optional[int] = None) -> None:
+        """
+        Import employees concurrently on a bounded thread pool, tallying
+        each result's status into `summary` as it completes. `employees`
+        is consumed lazily, a few rows ahead of the pool. Each row's
+        import_log slot is reserved as it is submitted, so the log keeps
+        input order whatever order the imports finish in. Each employee's
+        progress lines, including client diagnostics, are kept together and
+        written in input order every PROGRESS_FLUSH_EVERY employees rather
+        than per line.
 
-        return summary
+        Args:
+            employees: Employee dictionaries to import
+            courses_to_assign: Optional list of course IDs to assign
+            summary: Summary dictionary updated in place
+            total: Employee count for progress output, if known. When
+                omitted, summary['total'] is counted as rows are read.
+        """
+        pending: List[str] = []
+        pending_count = 0
+        finished: Dict[int, List[str]] = {}  # employee number -> lines, until its turn
+        next_to_write = 1
+
+        def run(i, slot, employee):
+            progress = f"{i}/{total}" if total is not None else f"{i}"
+            lines = [f"\n[{progress}] Processing {employee.get('email', 'N/A')}...\n"]
+            result = self._import_one(employee, courses_to_assign, lines)
+            self.import_log[slot] = result
+            return i, result, lines
+
+        def flush():
+            nonlocal pending_count
+            if pending:
+                sys.stdout.write("".join(pending))
+                pending.clear()
+            pending_count = 0
+
+        def tally(done):
+            nonlocal pending_count, next_to_write
+            for future in done:
+                i, result, lines = future.result()
+                finished[i] = lines
+                while next_to_write in finished:
+                    pending.extend(finished.pop(next_to_write))
+                    next_to_write += 1
+                    pending_count += 1
+                    if pending_count >= PROGRESS_FLUSH_EVERY:
+                        flush()
+                status = result.status
+                if status == 'success':
+                    summary['success'] += 1
+                elif status == 'skipped':
+                    summary['skipped'] += 1
+                else:
+                    summary['failed'] += 1
+
+        self._prefetch_existing_users()
+
+        max_in_flight = self.max_workers * 2
+        in_flight = set()
+        try:
+            with ThreadPoolExecutor(max_workers=self.max_workers) as pool:
+                for i, employee in enumerate(employees, 1):
+                    if total is None:
+                        summary['total'] += 1
+                    slot = len(self.import_log)
+                    self.import_log.append(None)
+                    in_flight.add(pool.submit(run, i, slot, employee))
+                    if len(in_flight) >= max_in_flight:
+                        done, in_flight = wait(in_flight, return_when=FIRST_COMPLETED)
+                        tally(done)
+                tally(wait(in_flight).done)
+        except Exception:
+            # The input failed mid-way: rows already submitted were still
+            # imported, so count and report them before re-raising
+            tally(wait(in_flight).done)
+            raise
+        finally:
+            # Anything still held back (e.g. the input failed mid-way) is written as is
+            for i in sorted(finished):
+                pending.extend(finished.pop(i))
+            flush()
 
     def save_import_log(self, output_file: str = ""):
         """
@@ -350,8 +692,9 @@ class EmployeeImporter:
         else:
             output_file = str(log_dir / output_file)
         output_file_str = str(output_file)
-        with open(output_file_str, 'w', encoding='utf-8') as f:
-            json.dump(self.import_log, f, indent=2)
+        # Encoded in one pass and written as a single bytes blob
+        with open(output_file_str, 'wb') as f:
+            f.write(_dumps_indented([r for r in self.import_log if r is not None]))
         print(f"\nImport log saved to {output_file_str}")
 
 
@@ -1,23 +1,23 @@
-import requests
-from config import DOMAIN, API_KEY    
+import sys
+
+from config import DOMAIN, API_KEY
+from import_employees import TalentLMSClient
 
 
 def list_courses():
-    url = f"https://{DOMAIN}/api/v1/courses"
-    
-    resp = requests.get(url, auth=(API_KEY, ""))  # API key as username, empty password
-    resp.raise_for_status()
-    
-    courses = resp.json()
-    print("\n=== TalentLMS Courses ===\n")
-    
+    # Pooled, retrying session shared with the rest of the TalentLMS tooling
+    with TalentLMSClient(DOMAIN, API_KEY) as client:
+        courses = client.get_courses()
+
+    lines = ["\n=== TalentLMS Courses ===\n"]
     for c in courses:
         cid = c.get("id")
         name = c.get("name")
         code = c.get("code") or "-"
-        print(f"ID: {cid:<5} | Code: {code:<10} | Name: {name}")
-    
-    print("\nTotal courses:", len(courses))
+        lines.append(f"ID: {cid:<5} | Code: {code:<10} | Name: {name}")
+    lines.append(f"\nTotal courses: {len(courses)}")
+
+    sys.stdout.write("\n".join(lines) + "\n")
 
 
 if __name__ == "__main__":
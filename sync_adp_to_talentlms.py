@@ -17,6 +17,7 @@ Usage:
 
 import sys
 import argparse
+from concurrent.futures import ThreadPoolExecutor
 from typing import Dict, List, Set
 
 from config import DOMAIN, API_KEY
@@ -205,11 +206,16 @@ Examples:
     # Initialize TalentLMS client
     client = TalentLMSClient(DOMAIN, API_KEY)
 
-    # Step 1: Get all existing TalentLMS users
-    existing_emails = get_all_talentlms_emails(client)
-
-    # Step 2: Get active ADP employees (optionally filtered by manager)
-    active_workers = get_active_adp_workers(manager_identifier=args.manager)
+    # Steps 1 and 2 are independent, so fetch from both systems concurrently:
+    # all existing TalentLMS users, and active ADP employees (optionally
+    # filtered by manager)
+    with ThreadPoolExecutor(max_workers=2) as pool:
+        emails_future = pool.submit(get_all_talentlms_emails, client)
+        workers_future = pool.submit(
+            get_active_adp_workers, manager_identifier=args.manager
+        )
+        existing_emails = emails_future.result()
+        active_workers = workers_future.result()
 
     if not active_workers:
         print("No active workers found. Nothing to sync.")
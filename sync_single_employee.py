@@ -17,7 +17,7 @@ Flow:
 import sys
 from typing import Dict, List, Optional
 
-from get_adp_info import get_workers, find_worker_by_identifier
+from get_adp_info import get_workers, find_worker_by_identifier, extract_work_email
 from import_employees import TalentLMSClient
 from config import DOMAIN, API_KEY      
 
@@ -32,22 +32,34 @@ def get_all_workers() -> List[Dict]:
     return data.get("workers", [])
 
 
+def _legal_name(worker: Dict) -> Dict[str, str]:
+    """
+    First/last/formatted name from person.legalName, extracted once and
+    kept on the worker dict under "_legal_name".
+    """
+    fields = worker.get("_legal_name")
+    if fields is None:
+        legal = (worker.get("person", {}) or {}).get("legalName", {}) or {}
+        fields = worker["_legal_name"] = {
+            "first": legal.get("givenName") or "",
+            "last": legal.get("familyName1") or "",
+            "formatted": legal.get("formattedName") or "",
+        }
+    return fields
+
+
 def worker_full_name(worker: Dict) -> str:
     """Return formatted legal name, or 'First Last'."""
-    legal = (worker.get("person", {}) or {}).get("legalName", {}) or {}
-    if "formattedName" in legal and legal["formattedName"]:
-        return legal["formattedName"]
-    first = legal.get("givenName", "") or ""
-    last = legal.get("familyName1", "") or ""
-    return f"{last}, {first}".strip(", ")
+    fields = _legal_name(worker)
+    if fields["formatted"]:
+        return fields["formatted"]
+    return f"{fields['last']}, {fields['first']}".strip(", ")
 
 
 def worker_first_last(worker: Dict) -> (str, str):
     """Return first and last name separately from legalName."""
-    legal = (worker.get("person", {}) or {}).get("legalName", {}) or {}
-    first = legal.get("givenName") or ""
-    last = legal.get("familyName1") or ""
-    return first, last
+    fields = _legal_name(worker)
+    return fields["first"], fields["last"]
 
 
 def get_work_email(worker: Dict) -> Optional[str]:
@@ -56,17 +68,8 @@ def get_work_email(worker: Dict) -> Optional[str]:
     Prioritizes businessCommunication over personal email.
     Returns None if no work email found.
     """
-    # Try businessCommunication first (work email)
-    bc = worker.get("businessCommunication", {}) or {}
-    emails = bc.get("emails", []) or []
-    if emails and isinstance(emails, list):
-        for email_obj in emails:
-            if isinstance(email_obj, dict):
-                email_uri = email_obj.get("emailUri")
-                if email_uri:
-                    return email_uri.strip()
-
-    return None
+    # Same lookup the ADP worker index uses
+    return extract_work_email(worker)
 
 
 # ------------- TalentLMS sync ------------- #